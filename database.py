@@ -1,11 +1,13 @@
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from typing import AsyncGenerator
 import asyncio
 import logging
 from dotenv import load_dotenv
 import os
+import uuid
 import streamlit as st
 
 load_dotenv()
@@ -14,24 +16,63 @@ logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL") or st.secrets.get("DATABASE_URL")
 
+# Pool bounds. Coroutines check out connections like threads do, so an async
+# workload needs headroom beyond the number of worker processes.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+
+if DB_POOL_SIZE < 1 or DB_MAX_OVERFLOW < 0:
+    raise ValueError(
+        f"Invalid pool bounds: DB_POOL_SIZE={DB_POOL_SIZE} must be >= 1 "
+        f"and DB_MAX_OVERFLOW={DB_MAX_OVERFLOW} must be >= 0"
+    )
+
+# Set PGBOUNCER=1 when connecting through a transaction-mode PgBouncer
+PGBOUNCER = os.getenv("PGBOUNCER") == "1"
+
+# asyncpg prepared-statement settings. The cache stays disabled by default to
+# avoid issues with transaction poolers; on a direct Postgres connection set
+# DB_STATEMENT_CACHE_SIZE (e.g. 1024) so each distinct query is parsed/planned
+# once. PgBouncer can hand a session a different server connection per
+# transaction, so there the cache is always off and statement names are made
+# unique to avoid collisions.
+if PGBOUNCER:
+    statement_cache_args = {
+        "statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+else:
+    statement_cache_args = {
+        "statement_cache_size": int(os.getenv("DB_STATEMENT_CACHE_SIZE", "0")),
+    }
+
+# Connection pool settings. Behind PgBouncer, pooling is left to PgBouncer so
+# connections aren't pooled twice; queue-pool sizing args don't apply there.
+if PGBOUNCER:
+    pool_args = {"poolclass": NullPool}
+else:
+    pool_args = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": DB_POOL_SIZE,          # Number of connections to maintain in pool
+        "max_overflow": DB_MAX_OVERFLOW,    # Additional connections beyond pool_size
+        "pool_recycle": 3600,               # Recycle connections after 1 hour
+        "pool_timeout": 30,                 # Timeout when getting connection from pool
+    }
+
 # Create async engine with proper connection pool settings
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
     future=True,
-    # Connection pool settings
-    pool_size=10,                    # Number of connections to maintain in pool
-    max_overflow=20,                 # Additional connections beyond pool_size
-    pool_recycle=3600,              # Recycle connections after 1 hour
+    **pool_args,
     pool_pre_ping=True,             # Test connections before use
-    pool_timeout=30,                # Timeout when getting connection from pool
     # Additional asyncpg-specific settings
     connect_args={
         "server_settings": {
             "application_name": "preptab_backend",
         },
         "command_timeout": 60,       # Command timeout in seconds
-        "statement_cache_size": 0,   # Disable statement cache to avoid issues
+        **statement_cache_args,
     }
 )
 
@@ -46,27 +87,34 @@ AsyncSessionLocal = sessionmaker(
 # Base class for models
 Base = declarative_base()
 
+# Reused health-check statement
+SELECT_ONE = text("SELECT 1")
+
 # Dependency to get DB session with proper error handling
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    session = None
-    try:
-        session = AsyncSessionLocal()
-        yield session
-    except Exception as e:
-        if session:
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        except Exception as e:
             await session.rollback()
-        logger.error(f"Database session error: {e}")
-        raise
-    finally:
-        if session:
-            await session.close()
+            logger.error(f"Database session error: {e}")
+            raise
 
 # Health check function
 async def check_database_connection():
     """Check if database connection is healthy"""
     try:
         async with AsyncSessionLocal() as session:
-            await session.execute("SELECT 1")
+            await session.execute(SELECT_ONE)
+            # Behind PgBouncer the app-side pool isn't what reaches Postgres
+            if not PGBOUNCER:
+                result = await session.execute(text("SHOW max_connections"))
+                max_connections = int(result.scalar())
+                if DB_POOL_SIZE + DB_MAX_OVERFLOW > max_connections:
+                    logger.warning(
+                        f"Pool ceiling {DB_POOL_SIZE + DB_MAX_OVERFLOW} exceeds "
+                        f"Postgres max_connections={max_connections}"
+                    )
         return True
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
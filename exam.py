@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Float, JSON, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Float, JSON, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func, text
@@ -14,14 +14,22 @@ class ExamType(str, Enum):
 
 class Exam(Base):
     __tablename__ = "exams"
+    __table_args__ = (
+        # Catalog filters: (type), (type, subject), (type, subject, year)
+        Index("ix_exams_type_subject_year", "exam_type", "subject", "year"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
-    exam_type = Column(SQLEnum(ExamType), nullable=False)
+    # Pinned to the name the existing backend schema created the type under
+    exam_type = Column(SQLEnum(ExamType, name="examtype", native_enum=True), nullable=False)
     subject = Column(String(100), nullable=False)
     year = Column(Integer, nullable=True)
     title = Column(String(255), nullable=True)
     duration = Column(Integer, nullable=True)  # in minutes
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Loaded with one batched "WHERE exam_id IN (...)" query instead of one per exam
+    questions = relationship("Question", back_populates="exam", lazy="selectin", order_by="Question.number")
+
     def __repr__(self):
         return f"<Exam(id={self.id}, type={self.exam_type}, subject={self.subject}, year={self.year}, title={self.title})>"
\ No newline at end of file
@@ -0,0 +1,30 @@
+-- Move question audio out of questions.verbose_audio (base64 strings in JSONB,
+-- {"en": "<base64>", "ha": "<base64>", ...}) into the question_audio table
+-- mapped by question_audio.QuestionAudio.
+--
+-- Run once against the existing schema before deploying the code that drops
+-- Question.verbose_audio:
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f migrations/0001_question_audio.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS question_audio (
+    question_id UUID NOT NULL REFERENCES questions (id) ON DELETE CASCADE,
+    lang VARCHAR(8) NOT NULL,
+    audio BYTEA NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    PRIMARY KEY (question_id, lang)
+);
+
+-- Copy every non-empty language entry, decoding base64 to raw bytes
+INSERT INTO question_audio (question_id, lang, audio)
+SELECT q.id, a.key, decode(a.value #>> '{}', 'base64')
+FROM questions AS q
+CROSS JOIN LATERAL jsonb_each(q.verbose_audio) AS a
+WHERE q.verbose_audio IS NOT NULL
+  AND jsonb_typeof(q.verbose_audio) = 'object'
+  AND jsonb_typeof(a.value) = 'string'
+  AND a.value #>> '{}' <> ''
+ON CONFLICT (question_id, lang) DO NOTHING;
+
+COMMIT;
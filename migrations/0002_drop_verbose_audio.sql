@@ -0,0 +1,6 @@
+-- Drop the legacy JSONB audio column once 0001_question_audio.sql has run and
+-- the copied rows in question_audio have been checked. Kept separate so the
+-- copy can be verified (and rolled back) before the source data is removed.
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f migrations/0002_drop_verbose_audio.sql
+
+ALTER TABLE questions DROP COLUMN IF EXISTS verbose_audio;
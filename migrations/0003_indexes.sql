@@ -0,0 +1,48 @@
+-- Create the indexes declared in Question.__table_args__ and
+-- Exam.__table_args__ on the existing schema; nothing runs create_all against
+-- the shared backend database.
+--
+-- CREATE INDEX CONCURRENTLY can't run inside a transaction block, so run this
+-- file with psql's default autocommit (no BEGIN, no --single-transaction):
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f migrations/0003_indexes.sql
+--
+-- A concurrent build that fails leaves an INVALID index behind, which
+-- IF NOT EXISTS then skips; drop it (DROP INDEX CONCURRENTLY ...) and rerun.
+
+-- ix_q_exam_number is unique; refuse to build it while duplicates exist
+DO $$
+DECLARE
+    duplicate_count bigint;
+BEGIN
+    SELECT count(*) INTO duplicate_count
+    FROM (
+        SELECT exam_id, number
+        FROM questions
+        GROUP BY exam_id, number
+        HAVING count(*) > 1
+    ) AS duplicates;
+
+    IF duplicate_count > 0 THEN
+        RAISE EXCEPTION '% duplicate (exam_id, number) pairs in questions; renumber them before creating ix_q_exam_number', duplicate_count;
+    END IF;
+END
+$$;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_q_exam_number
+    ON questions (exam_id, number);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_q_question_gin
+    ON questions USING gin (question jsonb_path_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_q_options_gin
+    ON questions USING gin (options jsonb_path_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_q_explanation_gin
+    ON questions USING gin (explanation jsonb_path_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_q_question_en_hash
+    ON questions USING hash ((question->>'en'));
+
+-- Catalog filters: (type), (type, subject), (type, subject, year)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_exams_type_subject_year
+    ON exams (exam_type, subject, year);
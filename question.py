@@ -1,10 +1,27 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.ext.hybrid import hybrid_method
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func, text
 from database import Base
+from question_audio import QuestionAudio
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        # Ordered per-exam fetch; also covers exam_id lookups as a left prefix
+        Index("ix_q_exam_number", "exam_id", "number", unique=True),
+        # GIN indexes for @> containment lookups on localized JSONB fields,
+        # e.g. Question.question.contains({"en": "..."}).
+        # jsonb_path_ops is smaller than the default jsonb_ops and serves @>.
+        Index("ix_q_question_gin", "question", postgresql_using="gin", postgresql_ops={"question": "jsonb_path_ops"}),
+        Index("ix_q_options_gin", "options", postgresql_using="gin", postgresql_ops={"options": "jsonb_path_ops"}),
+        Index("ix_q_explanation_gin", "explanation", postgresql_using="gin", postgresql_ops={"explanation": "jsonb_path_ops"}),
+        # Hash index on the English text for ->> equality, which GIN can't serve.
+        # Question text is free-form and can exceed the ~2.7KB B-tree row limit;
+        # hash entries store only a 4-byte hash, so any length can be indexed.
+        Index("ix_q_question_en_hash", text("(question->>'en')"), postgresql_using="hash"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     exam_id = Column(UUID(as_uuid=True), ForeignKey("exams.id"), nullable=False)
@@ -14,8 +31,28 @@ class Question(Base):
     answer = Column(Text, nullable=False)     # e.g., "A"
     explanation = Column(JSONB, nullable=True) # {"en": "...", ...}
     verbose = Column(JSONB, nullable=True) # {"en": "...", "ha": "...", ...}
-    verbose_audio = Column(JSONB, nullable=True) # {"en": <BLOB>, "ha": <BLOB>, ...}
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    exam = relationship("Exam", back_populates="questions")
+    # Audio lives in question_audio as bytea; load explicitly with selectinload(Question.audios)
+    audios = relationship("QuestionAudio", back_populates="question", lazy="noload", cascade="all, delete-orphan")
+
+    @hybrid_method
+    def question_contains(self, lang, value):
+        """Check if the question text for a language equals value.
+
+        Matches the SQL @> filter for scalar values such as strings; for JSON
+        arrays/objects @> tests containment rather than equality.
+        """
+        return (self.question or {}).get(lang) == value
+
+    @question_contains.expression
+    def question_contains(cls, lang, value):
+        """Filter with @> containment so ix_q_question_gin is used.
+
+        Prefer this over question->>'en' = ... equality, which can't use GIN.
+        """
+        return cls.question.contains({lang: value})
+
     def __repr__(self):
         return f"<Question(id={self .id}, number={self.number}, answer={self.answer})>"
\ No newline at end of file
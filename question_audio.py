@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from database import Base
+
+class QuestionAudio(Base):
+    __tablename__ = "question_audio"
+
+    question_id = Column(UUID(as_uuid=True), ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    lang = Column(String(8), primary_key=True)  # e.g., "en", "ha"
+    audio = Column(LargeBinary, nullable=False) # raw bytes, stored as bytea
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    question = relationship("Question", back_populates="audios")
+
+    def __repr__(self):
+        return f"<QuestionAudio(question_id={self.question_id}, lang={self.lang})>"
\ No newline at end of file
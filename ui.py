@@ -1,15 +1,23 @@
 import streamlit as st
+import pandas as pd
 import asyncio
+import base64
+import copy
 import json
+import math
+import os
+import re
+import threading
+import uuid
+import zlib
 from typing import Dict, List, Optional
 from datetime import datetime
-import uuid
 
 # Import from your existing modules
 from exam import Exam, ExamType
 from question import Question
-from database import AsyncSessionLocal, get_db
-from sqlalchemy import select, text
+from database import AsyncSessionLocal, SELECT_ONE
+from sqlalchemy import insert
 
 # Import localStorage functionality
 from streamlit_local_storage import LocalStorage
@@ -26,9 +34,37 @@ st.set_page_config(
 if 'localS' not in st.session_state:
     st.session_state.localS = LocalStorage()
 
-# LocalStorage keys
-EXAM_DATA_KEY = "preptab_exam_data"
-QUESTIONS_KEY = "preptab_questions"
+# LocalStorage key; exam data and questions are stored together as
+# {"exam": ..., "questions": ...} so each save is a single component call
+COMBINED_KEY = "preptab_state"
+
+# Keys used before exam data and questions were combined; still read once so
+# drafts saved by older versions are restored, and blanked when storage is cleared
+LEGACY_EXAM_DATA_KEY = "preptab_exam_data"
+LEGACY_QUESTIONS_KEY = "preptab_questions"
+
+# Locales stored in the database. Drafts only keep the locales that are filled
+# in (the form collects English); the rest are added by fill_locales() on save.
+LOCALES = ('en', 'ha', 'ig', 'yo')
+
+# Answer option keys
+OPTION_KEYS = ('A', 'B', 'C', 'D')
+OPTION_REQUIRED_ERROR = "Option %s is required"
+
+# Blank question form; copied, never modified
+EMPTY_QUESTION = {
+    'question': {'en': ''},
+    'options': {'A': '', 'B': '', 'C': '', 'D': ''},
+    'answer': 'A',
+    'explanation': {'en': ''},
+    'verbose': {}
+}
+
+# Rows shown on each side of the focused position in the reorder interface
+REORDER_WINDOW = 10
+
+# Questions rendered per page in the questions list
+QUESTIONS_PAGE_SIZE = 20
 
 # Available subjects
 SUBJECTS = [
@@ -52,86 +88,100 @@ SUBJECTS = [
 # Available years (2015 to 2025)
 EXAM_YEARS = list(range(2015, 2026))  # 2015 to 2025 inclusive
 
-# Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .section-header {
-        font-size: 1.5rem;
-        font-weight: bold;
-        color: #2c3e50;
-        margin-top: 2rem;
-        margin-bottom: 1rem;
-        border-bottom: 2px solid #3498db;
-        padding-bottom: 0.5rem;
-    }
-    .question-card {
-        border: 1px solid #ddd;
-        border-radius: 8px;
-        padding: 1rem;
-        margin: 1rem 0;
-        background-color: #f8f9fa;
-    }
-    .success-message {
-        background-color: #d4edda;
-        border: 1px solid #c3e6cb;
-        color: #155724;
-        padding: 1rem;
-        border-radius: 4px;
-        margin: 1rem 0;
-    }
-    .error-message {
-        background-color: #f8d7da;
-        border: 1px solid #f5c6cb;
-        color: #721c24;
-        padding: 1rem;
-        border-radius: 4px;
-        margin: 1rem 0;
-    }
-    .auto-save-indicator {
-        font-size: 0.85rem;
-        color: #6c757d;
-        font-style: italic;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Default year: current year, capped at the most recent year in range
+DEFAULT_YEAR = min(datetime.now().year, EXAM_YEARS[-1])
+
+# Selectbox options and value -> index lookups, so renders use O(1) dict
+# lookups instead of list.index() scans
+EXAM_TYPE_OPTIONS = tuple(e.value for e in ExamType)
+EXAM_TYPE_INDEX = {v: i for i, v in enumerate(EXAM_TYPE_OPTIONS)}
+SUBJECT_INDEX = {s: i for i, s in enumerate(SUBJECTS)}
+YEAR_INDEX = {y: i for i, y in enumerate(EXAM_YEARS)}
+
+# Custom CSS for better styling. Streamlit's static file serving sends .css
+# as text/plain with nosniff, so browsers won't apply a <link>ed stylesheet;
+# the rules are injected inline instead, and must be re-emitted every run.
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "styles.css")
+
+def minify_css(css: str) -> str:
+    """Drop comments and insignificant whitespace to shrink the per-rerun payload"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+@st.cache_resource(show_spinner=False)
+def load_app_css() -> str:
+    """The minified <style> block, read from disk once per process instead of every rerun"""
+    with open(CSS_PATH, encoding="utf-8") as css_file:
+        return f"<style>{minify_css(css_file.read())}</style>"
+
+APP_CSS = load_app_css()
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # Helper functions for localStorage
-def datetime_encoder(obj):
-    """Custom JSON encoder for datetime objects"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+# orjson serializes datetimes natively and is much faster than stdlib json;
+# its JSONDecodeError subclasses json.JSONDecodeError, so callers catch either.
+try:
+    import orjson
+
+    def dumps_json(obj) -> str:
+        """Serialize obj to a JSON string for localStorage"""
+        return orjson.dumps(obj).decode()
+
+    loads_json = orjson.loads
+except ImportError:
+    def datetime_encoder(obj):
+        """Custom JSON encoder for datetime objects"""
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+    def dumps_json(obj) -> str:
+        """Serialize obj to a JSON string for localStorage"""
+        return json.dumps(obj, default=datetime_encoder)
+
+    loads_json = json.loads
+
+# Payloads above this size are zlib-compressed before going through the
+# component bridge. Question text compresses well, whereas a binary format
+# like msgpack barely shrinks text and base64 would then make it larger.
+COMPRESS_THRESHOLD = 4096
+COMPRESSED_PREFIX = "z:"
+
+def encode_storage_payload(obj) -> str:
+    """Serialize obj for localStorage, compressing large payloads"""
+    payload = dumps_json(obj)
+    if len(payload) > COMPRESS_THRESHOLD:
+        compressed = base64.b64encode(zlib.compress(payload.encode(), 6)).decode('ascii')
+        return COMPRESSED_PREFIX + compressed
+    return payload
+
+def decode_storage_payload(value: str):
+    """Inverse of encode_storage_payload; plain JSON is read as-is"""
+    if value.startswith(COMPRESSED_PREFIX):
+        value = zlib.decompress(base64.b64decode(value[len(COMPRESSED_PREFIX):]))
+    return loads_json(value)
 
-def generate_exam_title():
+def generate_exam_title(exam_type, subject, year):
     """Generate exam title from exam_type, subject, and year"""
-    exam_type = st.session_state.exam_data.get('exam_type', '')
-    subject = st.session_state.exam_data.get('subject', '')
-    year = st.session_state.exam_data.get('year', '')
-    
-    if exam_type and subject and year:
-        return f"{exam_type} {subject} {year}"
-    return ""
+    return f"{exam_type} {subject} {year}" if exam_type and subject and year else ""
 
 def update_exam_title():
-    """Update exam title when exam details change"""
-    st.session_state.exam_data['title'] = generate_exam_title()
+    """Update exam title when exam details change, and return it"""
+    exam_data = st.session_state.exam_data
+    title = generate_exam_title(exam_data.get('exam_type'), exam_data.get('subject'), exam_data.get('year'))
+    # Only write when it actually changed
+    if exam_data.get('title') != title:
+        exam_data['title'] = title
+    return title
 
 def save_exam_to_storage():
     """Save exam data and questions to localStorage"""
     try:
-        # Update title before saving
-        update_exam_title()
-        
-        # Set flag to trigger save on next render
-        st.session_state.auto_saved = True
-        st.session_state.needs_save = True
+        # Bump the version so the next persist_exam_to_storage() writes
+        st.session_state.dirty_version = st.session_state.get('dirty_version', 0) + 1
         
         # Store last save time for debugging
         st.session_state.last_save_time = datetime.now().isoformat()
@@ -141,41 +191,111 @@ def save_exam_to_storage():
         st.session_state.storage_error = str(e)
         pass
 
+def storage_state_key():
+    """Cheap fingerprint of the state that is persisted to localStorage"""
+    exam_data = st.session_state.exam_data
+    return hash((
+        exam_data.get('exam_type'),
+        exam_data.get('subject'),
+        exam_data.get('year'),
+        exam_data.get('duration'),
+        len(st.session_state.questions),
+        st.session_state.get('dirty_version', 0),
+    ))
+
+def persist_exam_to_storage():
+    """Write exam data and questions to localStorage if they changed since the last write"""
+    state_key = storage_state_key()
+    if 'last_saved_hash' not in st.session_state:
+        # Nothing has changed yet on the first render; don't overwrite stored data
+        st.session_state.last_saved_hash = state_key
+        return
+    if state_key == st.session_state.last_saved_hash:
+        return
+    
+    try:
+        update_exam_title()
+        payload = encode_storage_payload({
+            'exam': st.session_state.exam_data,
+            'questions': st.session_state.questions
+        })
+        
+        # Use a counter to ensure unique keys for each render (required for components)
+        if 'save_counter' not in st.session_state:
+            st.session_state.save_counter = 0
+        st.session_state.save_counter += 1
+        
+        # This renders invisibly but needs to be in the UI flow to save to localStorage
+        st.session_state.localS.setItem(
+            COMBINED_KEY, 
+            payload, 
+            key=f"save_{st.session_state.save_counter}"
+        )
+        st.session_state.last_saved_hash = state_key
+        st.session_state.auto_saved = True
+    except Exception as e:
+        # Log error but don't break the app
+        st.session_state.storage_error = str(e)
+
+def is_stored_value(value) -> bool:
+    """Whether a getItem result holds data; erased keys come back empty"""
+    return isinstance(value, str) and bool(value.strip()) and value != "null"
+
+def load_legacy_storage_state():
+    """Read a draft saved under the legacy per-field keys, as {"exam": ..., "questions": ...}"""
+    state = {}
+    for field, key in (('exam', LEGACY_EXAM_DATA_KEY), ('questions', LEGACY_QUESTIONS_KEY)):
+        value = st.session_state.localS.getItem(key)
+        if is_stored_value(value):
+            try:
+                state[field] = loads_json(value)
+            except (ValueError, TypeError):
+                pass
+    return state or None
+
+def erase_storage_keys(counter: int):
+    """Remove the draft from localStorage, legacy keys included so it isn't restored from them.
+
+    setItem returns without writing when the value is "", so keys are erased
+    with eraseItem; each call renders a component and needs a unique key.
+    """
+    for key in (COMBINED_KEY, LEGACY_EXAM_DATA_KEY, LEGACY_QUESTIONS_KEY):
+        st.session_state.localS.eraseItem(key, key=f"clear_{key}_{counter}")
+
 def load_exam_from_storage():
     """Load exam data and questions from localStorage"""
     try:
-        # Use unique keys for each getItem call
-        # The library stores results in session_state with the key parameter
-        exam_data_key = f"load_{EXAM_DATA_KEY}"
-        questions_key = f"load_{QUESTIONS_KEY}"
+        # Call getItem - it returns the stored value directly
+        result = st.session_state.localS.getItem(COMBINED_KEY)
         
-        # Call getItem - the value will be stored in session_state after component renders
-        # Based on library docs, getItem(itemKey, key="session_state_key")
-        # But if key parameter doesn't work, we'll use a different approach
-        exam_data_result = st.session_state.localS.getItem(EXAM_DATA_KEY)
-        questions_result = st.session_state.localS.getItem(QUESTIONS_KEY)
-        
-        # Check if we got results directly or need to check session_state
         exam_data_loaded = False
         questions_loaded = False
         
-        # Try direct result first
-        if exam_data_result:
+        state = None
+        if is_stored_value(result):
             try:
-                if isinstance(exam_data_result, str) and exam_data_result.strip() and exam_data_result != "null":
-                    exam_data = json.loads(exam_data_result)
-                    st.session_state.exam_data = exam_data
-                    exam_data_loaded = True
-            except (json.JSONDecodeError, TypeError, AttributeError):
+                state = decode_storage_payload(result)
+            except (ValueError, zlib.error, TypeError):
                 pass
+        else:
+            state = load_legacy_storage_state()
         
-        if questions_result:
+        if state:
             try:
-                if isinstance(questions_result, str) and questions_result.strip() and questions_result != "null":
-                    questions = json.loads(questions_result)
+                # Process exam_data
+                exam_data = state.get('exam')
+                if exam_data and exam_data != st.session_state.get('exam_data'):
+                    st.session_state.exam_data = exam_data
+                    exam_data_loaded = True
+                
+                # Process questions
+                questions = state.get('questions')
+                if questions:
+                    ensure_question_ids(questions)
+                if questions and questions != st.session_state.get('questions'):
                     st.session_state.questions = questions
                     questions_loaded = True
-            except (json.JSONDecodeError, TypeError, AttributeError):
+            except (TypeError, AttributeError):
                 pass
         
         return exam_data_loaded or questions_loaded
@@ -192,144 +312,142 @@ def clear_exam_storage():
             st.session_state.clear_counter = 0
         st.session_state.clear_counter += 1
         
-        # Clear by setting empty strings - these need to render to work
-        st.session_state.localS.setItem(EXAM_DATA_KEY, "", key=f"clear_exam_{st.session_state.clear_counter}")
-        st.session_state.localS.setItem(QUESTIONS_KEY, "", key=f"clear_questions_{st.session_state.clear_counter}")
+        # Erase the stored draft - this needs to render to work
+        erase_storage_keys(st.session_state.clear_counter)
     except Exception as e:
         # Silently fail if localStorage is unavailable
         pass
 
 # Initialize session state - set defaults first
-if 'exam_data' not in st.session_state:
-    # Default year to 2025 (most recent in range) or current year if in range
-    default_year = min(datetime.now().year, max(EXAM_YEARS)) if datetime.now().year <= max(EXAM_YEARS) else max(EXAM_YEARS)
-    st.session_state.exam_data = {
+SESSION_DEFAULTS = {
+    'exam_data': {
         'exam_type': None,
         'subject': '',
-        'year': default_year,
+        'year': DEFAULT_YEAR,
         'title': '',
         'duration': 60
-    }
-
-if 'questions' not in st.session_state:
-    st.session_state.questions = []
+    },
+    'questions': [],
+    'current_question': EMPTY_QUESTION,
+}
 
-if 'current_question' not in st.session_state:
-    st.session_state.current_question = {
-        'question': {'en': '', 'ha': '', 'ig': '', 'yo': ''},
-        'options': {'A': '', 'B': '', 'C': '', 'D': ''},
-        'answer': 'A',
-        'explanation': {'en': '', 'ha': '', 'ig': '', 'yo': ''},
-        'verbose': {'en': '', 'ha': '', 'ig': '', 'yo': ''}
-    }
+for key, value in SESSION_DEFAULTS.items():
+    if key not in st.session_state:
+        st.session_state[key] = copy.deepcopy(value)
 
 # Helper functions
+def flash(message: str):
+    """Queue a toast for the next run, for messages shown right before st.rerun()"""
+    st.session_state['_flash'] = message
+
 def reset_current_question():
     """Reset the current question form"""
-    st.session_state.current_question = {
-        'question': {'en': '', 'ha': '', 'ig': '', 'yo': ''},
-        'options': {'A': '', 'B': '', 'C': '', 'D': ''},
-        'answer': 'A',
-        'explanation': {'en': '', 'ha': '', 'ig': '', 'yo': ''},
-        'verbose': {'en': '', 'ha': '', 'ig': '', 'yo': ''}
-    }
+    st.session_state.current_question = copy.deepcopy(EMPTY_QUESTION)
 
-def validate_question(question_data: Dict) -> List[str]:
-    """Validate question data and return list of errors"""
-    errors = []
-    
+def new_question_id() -> str:
+    """Stable identifier for a question, used for widget keys"""
+    return uuid.uuid4().hex
+
+def ensure_question_ids(questions: List[Dict]):
+    """Give questions saved before ids were introduced an id"""
+    for question in questions:
+        if '_id' not in question:
+            question['_id'] = new_question_id()
+
+def fill_locales(texts: Optional[Dict]) -> Dict:
+    """Return texts with an empty string for every locale that isn't set"""
+    filled = dict.fromkeys(LOCALES, '')
+    filled.update(texts or {})
+    return filled
+
+def iter_question_errors(question_data: Dict):
+    """Yield validation errors for question data, lazily"""
     # Check if question text is provided in at least English
     if not question_data['question']['en'].strip():
-        errors.append("Question text in English is required")
+        yield "Question text in English is required"
     
     # Check if all options are provided
-    for option in ['A', 'B', 'C', 'D']:
-        if not question_data['options'][option].strip():
-            errors.append(f"Option {option} is required")
+    options = question_data['options']
+    for option in OPTION_KEYS:
+        if not options[option].strip():
+            yield OPTION_REQUIRED_ERROR % option
     
     # Check if answer is selected
     if not question_data['answer']:
-        errors.append("Correct answer must be selected")
+        yield "Correct answer must be selected"
     
     # Check if explanation is provided in at least English
     if not question_data['explanation']['en'].strip():
-        errors.append("Explanation in English is required")
-    
-    return errors
+        yield "Explanation in English is required"
 
-async def save_exam_to_database(exam_data: Dict, questions: List[Dict]) -> Optional[str]:
-    """Save exam and questions to database"""
-    try:
-        async with AsyncSessionLocal() as db:
-            # Create exam
-            exam = Exam(
-                exam_type=ExamType(exam_data['exam_type']),
-                subject=exam_data['subject'],
-                year=exam_data['year'],
-                title=exam_data['title'],
-                duration=exam_data['duration']
-            )
-            
-            db.add(exam)
-            await db.flush()  # Get the exam ID
-            
-            # Create questions
-            for i, question_data in enumerate(questions, 1):
-                question = Question(
-                    exam_id=exam.id,
-                    number=i,
-                    question=question_data['question'],
-                    options=question_data['options'],
-                    answer=question_data['answer'],
-                    explanation=question_data['explanation'],
-                    verbose=question_data['verbose']
-                )
-                db.add(question)
-            
-            await db.commit()
-            return str(exam.id)
-            
-    except Exception as e:
-        st.error(f"Error saving to database: {str(e)}")
-        return None
+def validate_question(question_data: Dict) -> List[str]:
+    """Validate question data and return list of errors"""
+    return list(iter_question_errors(question_data))
+
+@st.cache_resource
+def get_event_loop():
+    """Long-lived event loop shared across reruns.
+
+    asyncpg connections are bound to the loop that opened them, so reusing one
+    loop lets the engine's pool keep its connections between calls instead of
+    asyncio.run() creating and closing a loop every time.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+def run_async(coro):
+    """Run a coroutine on the shared event loop and wait for its result"""
+    # Script runs for different sessions happen on different threads; the loop
+    # thread interleaves their coroutines instead of serializing on a lock
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+async def save_exam_to_database(exam_data: Dict, questions: List[Dict]) -> str:
+    """Save exam and questions to database; raises on failure.
+
+    Runs on the event loop thread, so it must not call Streamlit itself.
+    """
+    async with AsyncSessionLocal() as db:
+        # Create exam
+        exam = Exam(
+            exam_type=ExamType(exam_data['exam_type']),
+            subject=exam_data['subject'],
+            year=exam_data['year'],
+            title=exam_data['title'],
+            duration=exam_data['duration']
+        )
+        
+        db.add(exam)
+        await db.flush()  # Get the exam ID
+        
+        # Create questions with a single executemany-style INSERT
+        await db.execute(insert(Question), [
+            {
+                'exam_id': exam.id,
+                'number': i,
+                'question': fill_locales(question_data['question']),
+                'options': question_data['options'],
+                'answer': question_data['answer'],
+                'explanation': fill_locales(question_data['explanation']),
+                'verbose': fill_locales(question_data['verbose'])
+            }
+            for i, question_data in enumerate(questions, 1)
+        ])
+        
+        await db.commit()
+        return str(exam.id)
 
 # Main interface
 def main():
-    # Initialize localStorage components (they need to render to work)
-    # Call getItem to load data from localStorage - it returns the value directly
-    if 'localstorage_initialized' not in st.session_state:
-        # Try to load data from localStorage
-        try:
-            exam_data_result = st.session_state.localS.getItem(EXAM_DATA_KEY)
-            questions_result = st.session_state.localS.getItem(QUESTIONS_KEY)
-            
-            # Process exam_data
-            if exam_data_result and isinstance(exam_data_result, str) and exam_data_result.strip() and exam_data_result != "null":
-                try:
-                    exam_data = json.loads(exam_data_result)
-                    if exam_data and exam_data != st.session_state.get('exam_data'):
-                        st.session_state.exam_data = exam_data
-                        if 'data_restored_shown' not in st.session_state:
-                            st.session_state.data_restored_shown = True
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            
-            # Process questions
-            if questions_result and isinstance(questions_result, str) and questions_result.strip() and questions_result != "null":
-                try:
-                    questions = json.loads(questions_result)
-                    if questions and questions != st.session_state.get('questions'):
-                        st.session_state.questions = questions
-                        if 'data_restored_shown' not in st.session_state:
-                            st.session_state.data_restored_shown = True
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            
-            st.session_state.localstorage_initialized = True
-        except Exception as e:
-            # Silently fail if localStorage is unavailable
-            st.session_state.localstorage_initialized = True
-            pass
+    # Show the message queued by the action that triggered this rerun
+    if message := st.session_state.pop('_flash', None):
+        st.toast(message)
+    
+    # Load data from localStorage once per session
+    if not st.session_state.get('localstorage_initialized'):
+        if load_exam_from_storage() and 'data_restored_shown' not in st.session_state:
+            st.session_state.data_restored_shown = True
+        st.session_state.localstorage_initialized = True
     
     # Show restoration message if data was loaded from localStorage
     if st.session_state.get('data_restored_shown', False) and not st.session_state.get('restore_message_shown', False):
@@ -348,33 +466,11 @@ def main():
     
     pg = st.navigation(pages, position="sidebar")
     pg.run()
+    
+    # Single localStorage save site; skipped when nothing changed
+    persist_exam_to_storage()
 
 def create_exam_page():
-    # Save to localStorage at the start if needed (before any UI that might cause rerun)
-    if st.session_state.get('needs_save', False):
-        try:
-            update_exam_title()
-            exam_data_json = json.dumps(st.session_state.exam_data, default=datetime_encoder)
-            questions_json = json.dumps(st.session_state.questions, default=datetime_encoder)
-            
-            if 'save_counter' not in st.session_state:
-                st.session_state.save_counter = 0
-            st.session_state.save_counter += 1
-            
-            st.session_state.localS.setItem(
-                EXAM_DATA_KEY, 
-                exam_data_json, 
-                key=f"save_exam_{st.session_state.save_counter}"
-            )
-            st.session_state.localS.setItem(
-                QUESTIONS_KEY, 
-                questions_json, 
-                key=f"save_questions_{st.session_state.save_counter}"
-            )
-            st.session_state.needs_save = False
-        except Exception:
-            pass
-    
     st.markdown('<h2 class="section-header">Exam Details</h2>', unsafe_allow_html=True)
     
     # Exam details form
@@ -382,51 +478,45 @@ def create_exam_page():
     
     with col1:
         # Get current exam_type index
-        exam_type_options = [e.value for e in ExamType]
         current_exam_type = st.session_state.exam_data.get('exam_type')
-        exam_type_index = exam_type_options.index(current_exam_type) if current_exam_type in exam_type_options else 0
+        exam_type_index = EXAM_TYPE_INDEX.get(current_exam_type, 0)
         
         exam_type = st.selectbox(
             "Exam Type",
-            options=exam_type_options,
+            options=EXAM_TYPE_OPTIONS,
             index=exam_type_index,
-            help="Select the type of exam you're creating",
-            on_change=save_exam_to_storage
+            help="Select the type of exam you're creating"
         )
         st.session_state.exam_data['exam_type'] = exam_type
     
     with col2:
         # Get current subject index
         current_subject = st.session_state.exam_data.get('subject', '')
-        subject_index = SUBJECTS.index(current_subject) if current_subject in SUBJECTS else 0
+        subject_index = SUBJECT_INDEX.get(current_subject, 0)
         
         subject = st.selectbox(
             "Subject",
             options=SUBJECTS,
             index=subject_index,
-            help="Select the subject for this exam",
-            on_change=save_exam_to_storage
+            help="Select the subject for this exam"
         )
         st.session_state.exam_data['subject'] = subject
     
     with col3:
         # Get current year index
-        default_year = min(datetime.now().year, max(EXAM_YEARS)) if datetime.now().year <= max(EXAM_YEARS) else max(EXAM_YEARS)
-        current_year = st.session_state.exam_data.get('year', default_year)
-        year_index = EXAM_YEARS.index(current_year) if current_year in EXAM_YEARS else len(EXAM_YEARS) - 1
+        current_year = st.session_state.exam_data.get('year', DEFAULT_YEAR)
+        year_index = YEAR_INDEX.get(current_year, len(EXAM_YEARS) - 1)
         
         year = st.selectbox(
             "Year",
             options=EXAM_YEARS,
             index=year_index,
-            help="Select the year for this exam",
-            on_change=save_exam_to_storage
+            help="Select the year for this exam"
         )
         st.session_state.exam_data['year'] = year
     
     # Auto-generate and display title
-    exam_title = generate_exam_title()
-    st.session_state.exam_data['title'] = exam_title
+    exam_title = update_exam_title()
     
     if exam_title:
         st.info(f"**Exam Title:** {exam_title}")
@@ -437,8 +527,7 @@ def create_exam_page():
         min_value=15,
         max_value=300,
         value=st.session_state.exam_data.get('duration', 60),
-        help="Enter the duration in minutes",
-        on_change=save_exam_to_storage
+        help="Enter the duration in minutes"
     )
     st.session_state.exam_data['duration'] = duration
     
@@ -446,47 +535,8 @@ def create_exam_page():
     if st.session_state.get('auto_saved', False):
         st.markdown('<p class="auto-save-indicator">💾 Auto-saved to browser storage</p>', unsafe_allow_html=True)
     
-    # Always render localStorage save components when data changes
-    # Streamlit components need to be in the render flow to work
-    if st.session_state.get('needs_save', False):
-        try:
-            exam_data_json = json.dumps(st.session_state.exam_data, default=datetime_encoder)
-            questions_json = json.dumps(st.session_state.questions, default=datetime_encoder)
-            
-            # Use a counter to ensure unique keys for each render (required for components)
-            if 'save_counter' not in st.session_state:
-                st.session_state.save_counter = 0
-            st.session_state.save_counter += 1
-            
-            # Render the localStorage components - they need to be in the UI flow
-            with st.container():
-                # These will render invisibly but will save to localStorage
-                st.session_state.localS.setItem(
-                    EXAM_DATA_KEY, 
-                    exam_data_json, 
-                    key=f"persist_exam_{st.session_state.save_counter}"
-                )
-                st.session_state.localS.setItem(
-                    QUESTIONS_KEY, 
-                    questions_json, 
-                    key=f"persist_questions_{st.session_state.save_counter}"
-                )
-            
-            # Reset the flag after rendering
-            st.session_state.needs_save = False
-        except Exception as e:
-            # Silently handle errors
-            st.session_state.needs_save = False
-            pass
-    
     st.markdown('<h2 class="section-header">Add Question</h2>', unsafe_allow_html=True)
     
-    # Show success message if question was just added
-    if st.session_state.get('question_added_success', False):
-        total_questions = len(st.session_state.questions)
-        st.success(f"✅ Question {total_questions} added successfully! Total questions: {total_questions}")
-        st.session_state.question_added_success = False  # Reset flag after showing
-    
     # Question form
     with st.form("question_form", clear_on_submit=True):
         
@@ -497,54 +547,34 @@ def create_exam_page():
             height=100,
             help="Enter the question text"
         )
-        st.session_state.current_question['question']['en'] = question_en
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            option_a = st.text_input(
-                "Option A",
-                value=st.session_state.current_question['options']['A'],
-                placeholder="Enter option A"
-            )
-            st.session_state.current_question['options']['A'] = option_a
-            
-            option_b = st.text_input(
-                "Option B",
-                value=st.session_state.current_question['options']['B'],
-                placeholder="Enter option B"
-            )
-            st.session_state.current_question['options']['B'] = option_b
         
-        with col2:
-            option_c = st.text_input(
-                "Option C",
-                value=st.session_state.current_question['options']['C'],
-                placeholder="Enter option C"
-            )
-            st.session_state.current_question['options']['C'] = option_c
-            
-            option_d = st.text_input(
-                "Option D",
-                value=st.session_state.current_question['options']['D'],
-                placeholder="Enter option D"
-            )
-            st.session_state.current_question['options']['D'] = option_d
+        # All four options in one table widget instead of four text inputs
+        st.markdown("**Options**")
+        options_df = pd.DataFrame({
+            'Option': OPTION_KEYS,
+            'Text': [st.session_state.current_question['options'][o] for o in OPTION_KEYS]
+        })
+        edited_options = st.data_editor(
+            options_df,
+            column_config={
+                'Option': st.column_config.TextColumn(disabled=True, width="small"),
+                'Text': st.column_config.TextColumn(help="Enter the option text")
+            },
+            hide_index=True,
+            num_rows="fixed",
+            use_container_width=True
+        )
         
         # Correct answer
         st.markdown("**Correct Answer**")
         correct_answer = st.pills(
             "Select the correct answer",
-            options=['A', 'B', 'C', 'D'],
+            options=OPTION_KEYS,
             default=st.session_state.current_question['answer'],
             selection_mode="single",
             help="Select the correct answer",
             label_visibility="collapsed"
         )
-        if correct_answer:
-            st.session_state.current_question['answer'] = correct_answer
-        else:
-            st.session_state.current_question['answer'] = 'A'  # Default to 'A' if None
         
         explanation_en = st.text_area(
             "Explanation",
@@ -553,7 +583,6 @@ def create_exam_page():
             height=100,
             help="Enter the explanation for the correct answer"
         )
-        st.session_state.current_question['explanation']['en'] = explanation_en
         
         # Form buttons
         col1, col2, col3 = st.columns(3)
@@ -567,27 +596,35 @@ def create_exam_page():
         with col3:
             save_exam = st.form_submit_button("💾 Save Exam to Database", type="secondary")
         
+        # Build the question from the submitted values only when it's needed
+        if add_question or save_exam:
+            current = st.session_state.current_question
+            question_copy = {
+                'question': {**current['question'], 'en': question_en},
+                'options': dict(zip(OPTION_KEYS, edited_options['Text'].fillna('').astype(str))),
+                'answer': correct_answer or 'A',  # Default to 'A' if None
+                'explanation': {**current['explanation'], 'en': explanation_en},
+                'verbose': dict(current['verbose']),
+                '_id': new_question_id()
+            }
+            # Keep the values in the form after clear_on_submit
+            st.session_state.current_question = question_copy
+        
         # Handle form submissions
         if add_question:
             # Validate question
-            errors = validate_question(st.session_state.current_question)
+            errors = validate_question(question_copy)
             
             if errors:
                 for error in errors:
                     st.error(error)
             else:
                 # Add question to list
-                question_copy = {
-                    'question': st.session_state.current_question['question'].copy(),
-                    'options': st.session_state.current_question['options'].copy(),
-                    'answer': st.session_state.current_question['answer'],
-                    'explanation': st.session_state.current_question['explanation'].copy(),
-                    'verbose': st.session_state.current_question['verbose'].copy()
-                }
                 st.session_state.questions.append(question_copy)
                 save_exam_to_storage()  # Auto-save after adding question
                 reset_current_question()
-                st.session_state.question_added_success = True
+                total_questions = len(st.session_state.questions)
+                flash(f"✅ Question {total_questions} added successfully! Total questions: {total_questions}")
                 st.rerun()
         
         if clear_form:
@@ -609,22 +646,19 @@ def create_exam_page():
                 update_exam_title()
                 # Save to database
                 with st.spinner("Saving exam to database..."):
-                    exam_id = asyncio.run(save_exam_to_database(
-                        st.session_state.exam_data,
-                        st.session_state.questions
-                    ))
+                    try:
+                        exam_id = run_async(save_exam_to_database(
+                            st.session_state.exam_data,
+                            st.session_state.questions
+                        ))
+                    except Exception as e:
+                        st.error(f"Error saving to database: {str(e)}")
+                        exam_id = None
                 
                 if exam_id:
-                    st.success(f"🎉 Exam saved successfully! Exam ID: {exam_id}")
+                    flash(f"🎉 Exam saved successfully! Exam ID: {exam_id}")
                     # Reset session state first
-                    default_year = min(datetime.now().year, max(EXAM_YEARS)) if datetime.now().year <= max(EXAM_YEARS) else max(EXAM_YEARS)
-                    st.session_state.exam_data = {
-                        'exam_type': None,
-                        'subject': '',
-                        'year': default_year,
-                        'title': '',
-                        'duration': 60
-                    }
+                    st.session_state.exam_data = copy.deepcopy(SESSION_DEFAULTS['exam_data'])
                     st.session_state.questions = []
                     reset_current_question()
                     st.session_state.auto_saved = False
@@ -642,40 +676,139 @@ def create_exam_page():
                 st.session_state.clear_counter = 0
             st.session_state.clear_counter += 1
             
-            # Render clear components - they need to be in UI flow to work
-            st.session_state.localS.setItem(EXAM_DATA_KEY, "", key=f"clear_exam_{st.session_state.clear_counter}")
-            st.session_state.localS.setItem(QUESTIONS_KEY, "", key=f"clear_questions_{st.session_state.clear_counter}")
+            # Render clear component - it needs to be in UI flow to work
+            erase_storage_keys(st.session_state.clear_counter)
             st.session_state.should_clear_storage = False
+            # Storage now matches the freshly reset session
+            st.session_state.last_saved_hash = storage_state_key()
         except Exception:
             st.session_state.should_clear_storage = False
             pass
+
+def move_pending_question(pos: int, offset: int):
+    """Swap a question with its neighbour in the pending reorder"""
+    order = st.session_state.pending_order
+    order[pos], order[pos + offset] = order[pos + offset], order[pos]
+    # Keep the reorder window centred on the question being moved
+    if 'reorder_focus' in st.session_state:
+        st.session_state.reorder_focus = pos + offset + 1
+
+def question_previews() -> List[str]:
+    """Truncated English text of every question, recomputed only after the
+    questions change (every change goes through save_exam_to_storage)"""
+    version = st.session_state.get('dirty_version', 0)
+    cached = st.session_state.get('preview_cache')
+    if cached is None or cached[0] != version or len(cached[1]) != len(st.session_state.questions):
+        previews = []
+        for question in st.session_state.questions:
+            text = question['question']['en']
+            previews.append(text[:50] + "..." if len(text) > 50 else text)
+        cached = st.session_state.preview_cache = (version, previews)
+    return cached[1]
+
+@st.fragment
+def render_reorder_interface():
+    """Reorder interface; moves only rerun this fragment, not the whole page"""
+    st.markdown("### Reorder Questions")
+    st.info("Use the arrows to reorder questions. Click 'Save Order' when done.")
+    
+    # Moves only permute this list of indices; questions are reordered on save
+    pending_order = st.session_state.get('pending_order')
+    if pending_order is None or len(pending_order) != len(st.session_state.questions):
+        pending_order = st.session_state.pending_order = list(range(len(st.session_state.questions)))
+    
+    # Only render a window of rows around the focused position, so long
+    # exams don't produce three widgets per question on every click
+    last = len(pending_order) - 1
+    start, end = 0, len(pending_order)
+    if len(pending_order) > 2 * REORDER_WINDOW:
+        if st.session_state.get('reorder_focus', 1) > len(pending_order):
+            st.session_state.reorder_focus = len(pending_order)
+        focus = st.number_input(
+            "Jump to position",
+            min_value=1,
+            max_value=len(pending_order),
+            key='reorder_focus'
+        ) - 1
+        start = max(0, focus - REORDER_WINDOW)
+        end = min(len(pending_order), focus + REORDER_WINDOW)
+    
+    # Create a simple reorder interface
+    for pos in range(start, end):
+        question = st.session_state.questions[pending_order[pos]]
+        col1, col2, col3 = st.columns([1, 8, 1])
+        with col1:
+            st.write(f"**{pos+1}**")
+        with col2:
+            st.write(f"{question['question']['en'][:80]}...")
+        with col3:
+            st.button("⬆️", key=f"up_{question['_id']}", disabled=(pos == 0),
+                      on_click=move_pending_question, args=(pos, -1))
+            st.button("⬇️", key=f"down_{question['_id']}", disabled=(pos == last),
+                      on_click=move_pending_question, args=(pos, 1))
     
-    # Always save to localStorage at the end of the page if we have questions
-    # This ensures data persists even if other saves didn't trigger
-    if 'questions' in st.session_state and len(st.session_state.questions) > 0:
-        try:
-            update_exam_title()
-            exam_data_json = json.dumps(st.session_state.exam_data, default=datetime_encoder)
-            questions_json = json.dumps(st.session_state.questions, default=datetime_encoder)
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("✅ Save Order", type="primary"):
+            questions = st.session_state.questions
+            st.session_state.questions = [questions[i] for i in pending_order]
+            st.session_state.show_reorder = False
+            del st.session_state.pending_order
+            save_exam_to_storage()  # Auto-save once with the final order
+            flash("Question order saved!")
+            st.rerun(scope="app")
+    with col2:
+        if st.button("❌ Cancel", type="secondary"):
+            st.session_state.show_reorder = False
+            del st.session_state.pending_order
+            st.rerun(scope="app")
+
+@st.fragment
+def render_question_card(i: int):
+    """Question card; deleting or editing changes the list, so those rerun the whole app"""
+    if i >= len(st.session_state.questions):
+        return
+    question = st.session_state.questions[i]
+    with st.container():
+        # Question header with delete button
+        col1, col2 = st.columns([8, 1])
+        
+        with col1:
+            question_preview = question_previews()[i]
+            st.markdown(f"**Question {i+1}:** {question_preview}")
+        
+        with col2:
+            if st.button("🗑️", key=f"delete_{question['_id']}", help="Delete this question"):
+                del st.session_state.questions[i]
+                save_exam_to_storage()  # Auto-save after deleting
+                flash(f"Question {i+1} deleted!")
+                st.rerun(scope="app")
+        
+        # An expander still runs its body while collapsed, so the details are
+        # only rendered once the card's toggle is switched on
+        if st.toggle(f"View Details - Question {i+1}", key=f"open_{question['_id']}"):
+            st.markdown("**Question:**")
+            st.write(question['question']['en'])
             
-            # Use a stable key pattern that updates each render
-            if 'final_save_counter' not in st.session_state:
-                st.session_state.final_save_counter = 0
-            st.session_state.final_save_counter += 1
+            st.markdown("**Options:**")
+            # One markdown element rather than two columns of st.write calls
+            st.markdown("\n".join(
+                f"- {'✅' if option == question['answer'] else '⚪'} **{option}:** {question['options'][option]}"
+                for option in OPTION_KEYS
+            ))
             
-            # Render components at end to ensure they execute
-            st.session_state.localS.setItem(
-                EXAM_DATA_KEY, 
-                exam_data_json, 
-                key=f"final_save_exam_{st.session_state.final_save_counter}"
-            )
-            st.session_state.localS.setItem(
-                QUESTIONS_KEY, 
-                questions_json, 
-                key=f"final_save_questions_{st.session_state.final_save_counter}"
-            )
-        except Exception:
-            pass
+            st.markdown("**Explanation:**")
+            st.write(question['explanation']['en'])
+            
+            # Edit question button
+            if st.button(f"✏️ Edit Question {i+1}", key=f"edit_{question['_id']}"):
+                # Copy question data to current question form
+                st.session_state.current_question = copy.deepcopy(question)
+                # Remove the question from the list
+                del st.session_state.questions[i]
+                save_exam_to_storage()  # Auto-save after editing (removing from list)
+                flash(f"Question {i+1} moved to edit form!")
+                st.rerun(scope="app")
 
 def view_questions_page():
     st.markdown('<h2 class="section-header">Current Questions</h2>', unsafe_allow_html=True)
@@ -708,116 +841,67 @@ def view_questions_page():
         if st.button("🗑️ Clear All Questions", type="secondary"):
             st.session_state.questions = []
             save_exam_to_storage()  # Auto-save after clearing
-            st.success("All questions cleared!")
-            st.rerun()
+            flash("All questions cleared!")
+            st.session_state.needs_rerun = True
     
     with col2:
         if st.button("📋 Duplicate Last Question", type="secondary"):
             if st.session_state.questions:
                 last_question = st.session_state.questions[-1].copy()
+                last_question['_id'] = new_question_id()
                 st.session_state.questions.append(last_question)
                 save_exam_to_storage()  # Auto-save after duplicating
-                st.success("Last question duplicated!")
-                st.rerun()
+                flash("Last question duplicated!")
+                st.session_state.needs_rerun = True
             else:
                 st.warning("No questions to duplicate")
     
     with col3:
         if st.button("🔄 Reorder Questions", type="secondary"):
             st.session_state.show_reorder = not st.session_state.get('show_reorder', False)
-            st.rerun()
+            st.session_state.pop('pending_order', None)
+            st.session_state.needs_rerun = True
     
     # Reorder interface
     if st.session_state.get('show_reorder', False):
-        st.markdown("### Reorder Questions")
-        st.info("Drag and drop to reorder questions. Click 'Save Order' when done.")
-        
-        # Create a simple reorder interface
-        for i, question in enumerate(st.session_state.questions):
-            col1, col2, col3 = st.columns([1, 8, 1])
-            with col1:
-                st.write(f"**{i+1}**")
-            with col2:
-                st.write(f"{question['question']['en'][:80]}...")
-            with col3:
-                if st.button("⬆️", key=f"up_{i}", disabled=(i == 0)):
-                    # Move question up
-                    if i > 0:
-                        st.session_state.questions[i], st.session_state.questions[i-1] = st.session_state.questions[i-1], st.session_state.questions[i]
-                        save_exam_to_storage()  # Auto-save after reordering
-                        st.rerun()
-                if st.button("⬇️", key=f"down_{i}", disabled=(i == len(st.session_state.questions)-1)):
-                    # Move question down
-                    if i < len(st.session_state.questions)-1:
-                        st.session_state.questions[i], st.session_state.questions[i+1] = st.session_state.questions[i+1], st.session_state.questions[i]
-                        save_exam_to_storage()  # Auto-save after reordering
-                        st.rerun()
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("✅ Save Order", type="primary"):
-                st.session_state.show_reorder = False
-                st.success("Question order saved!")
-                st.rerun()
-        with col2:
-            if st.button("❌ Cancel", type="secondary"):
-                st.session_state.show_reorder = False
-                st.rerun()
+        render_reorder_interface()
     
-    # Display questions with delete functionality
+    # Display questions with delete functionality, one page at a time
     st.markdown("### Questions List")
-    for i, question in enumerate(st.session_state.questions):
-        with st.container():
-            # Question header with delete button
-            col1, col2 = st.columns([8, 1])
-            
-            with col1:
-                question_preview = question['question']['en'][:50] + "..." if len(question['question']['en']) > 50 else question['question']['en']
-                st.markdown(f"**Question {i+1}:** {question_preview}")
-            
-            with col2:
-                if st.button("🗑️", key=f"delete_{i}", help="Delete this question"):
-                    st.session_state.questions.pop(i)
-                    save_exam_to_storage()  # Auto-save after deleting
-                    st.success(f"Question {i+1} deleted!")
-                    st.rerun()
-            
-            # Question details in expander
-            with st.expander(f"View Details - Question {i+1}", expanded=False):
-                st.markdown("**Question:**")
-                st.write(question['question']['en'])
-                
-                st.markdown("**Options:**")
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    for option in ['A', 'B']:
-                        marker = "✅" if option == question['answer'] else "⚪"
-                        st.write(f"{marker} {option}: {question['options'][option]}")
-                
-                with col2:
-                    for option in ['C', 'D']:
-                        marker = "✅" if option == question['answer'] else "⚪"
-                        st.write(f"{marker} {option}: {question['options'][option]}")
-                
-                st.markdown("**Explanation:**")
-                st.write(question['explanation']['en'])
-                
-                # Edit question button
-                if st.button(f"✏️ Edit Question {i+1}", key=f"edit_{i}"):
-                    # Copy question data to current question form
-                    st.session_state.current_question = {
-                        'question': question['question'].copy(),
-                        'options': question['options'].copy(),
-                        'answer': question['answer'],
-                        'explanation': question['explanation'].copy(),
-                        'verbose': question['verbose'].copy()
-                    }
-                    # Remove the question from the list
-                    st.session_state.questions.pop(i)
-                    save_exam_to_storage()  # Auto-save after editing (removing from list)
-                    st.success(f"Question {i+1} moved to edit form!")
-                    st.rerun()
+    questions = st.session_state.questions
+    start = 0
+    if len(questions) > QUESTIONS_PAGE_SIZE:
+        page_count = math.ceil(len(questions) / QUESTIONS_PAGE_SIZE)
+        if st.session_state.get('q_page', 1) > page_count:
+            st.session_state.q_page = page_count
+        page = st.number_input(
+            f"Page (of {page_count})",
+            min_value=1,
+            max_value=page_count,
+            key='q_page'
+        )
+        start = (page - 1) * QUESTIONS_PAGE_SIZE
+    
+    for i in range(start, min(start + QUESTIONS_PAGE_SIZE, len(questions))):
+        render_question_card(i)
+    
+    # Rerun once after all of this render's state changes
+    if st.session_state.pop('needs_rerun', False):
+        st.rerun()
+
+async def test_connection():
+    """Run a trivial query to check the database is reachable"""
+    async with AsyncSessionLocal() as db:
+        await db.execute(SELECT_ONE)
+        return True
+
+@st.cache_resource(ttl=30, show_spinner=False)
+def probe_database():
+    """Connection check shared by all sessions for up to 30 seconds.
+
+    Failures raise and aren't cached, so they're retried on the next visit.
+    """
+    return run_async(test_connection())
 
 def database_status_page():
     st.markdown('<h2 class="section-header">Database Status</h2>', unsafe_allow_html=True)
@@ -825,12 +909,7 @@ def database_status_page():
     # Test database connection
     with st.spinner("Testing database connection..."):
         try:
-            async def test_connection():
-                async with AsyncSessionLocal() as db:
-                    result = await db.execute(text("SELECT 1"))
-                    return True
-            
-            connection_ok = asyncio.run(test_connection())
+            connection_ok = probe_database()
             
             if connection_ok:
                 st.success("✅ Database connection successful!")
@@ -854,8 +933,8 @@ def database_status_page():
         
         if st.session_state.questions:
             st.markdown("**Question Preview:**")
-            for i, q in enumerate(st.session_state.questions[:3], 1):
-                st.write(f"{i}. {q['question']['en'][:50]}...")
+            for i, preview in enumerate(question_previews()[:3], 1):
+                st.write(f"{i}. {preview}")
             if len(st.session_state.questions) > 3:
                 st.write(f"... and {len(st.session_state.questions) - 3} more")
 